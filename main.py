@@ -1,7 +1,5 @@
 import asyncio
 import json
-import re
-from pathlib import Path
 from typing import Any, Sequence
 
 from mcp.server import Server
@@ -16,42 +14,50 @@ from mcp.types import (
 import mcp.server.stdio
 import mcp.types as types
 
+# uvloop does not support Windows; asyncio's own loop is used there
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from prompty_core import BASIC_PROFILE, improve_prompt_locally
+
 
 server = Server("prompt-improver")
 
 
-async def read_improvement_prompt() -> str:
-    """Read the improvement prompt from the dedicated file."""
-    prompt_file = Path(__file__).parent / "improvement_prompt.md"
-    if prompt_file.exists():
-        return prompt_file.read_text(encoding="utf-8")
-    return "Improve the following prompt to be clearer and more effective:"
+# The tool list never changes, so it is built once and shared between calls
+_TOOLS = [
+    types.Tool(
+        name="improve_prompt",
+        description="Improve a user's prompt using AI sampling to make it clearer and more effective",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_prompt": {
+                    "type": "string",
+                    "description": "The original prompt from the user that needs improvement"
+                },
+                "context": {
+                    "type": "string",
+                    "description": "Optional context about what the user is trying to achieve",
+                    "default": ""
+                }
+            },
+            "required": ["user_prompt"]
+        }
+    )
+]
+
+
+# Fixed error reply, built once rather than on every invalid call
+_ERR_NO_PROMPT = [types.TextContent(type="text", text="Error: No prompt provided to improve.")]
 
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools."""
-    return [
-        types.Tool(
-            name="improve_prompt",
-            description="Improve a user's prompt using AI sampling to make it clearer and more effective",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_prompt": {
-                        "type": "string",
-                        "description": "The original prompt from the user that needs improvement"
-                    },
-                    "context": {
-                        "type": "string",
-                        "description": "Optional context about what the user is trying to achieve",
-                        "default": ""
-                    }
-                },
-                "required": ["user_prompt"]
-            }
-        )
-    ]
+    return _TOOLS
 
 
 @server.call_tool()
@@ -64,14 +70,11 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.T
     context = arguments.get("context", "")
     
     if not user_prompt:
-        return [types.TextContent(
-            type="text",
-            text="Error: No prompt provided to improve."
-        )]
+        return _ERR_NO_PROMPT
     
     try:
         # Use local sampling-based improvement
-        improved_prompt = await improve_prompt_locally(user_prompt, context)
+        improved_prompt = improve_prompt_locally(user_prompt, context, BASIC_PROFILE)
         
         return [types.TextContent(
             type="text",
@@ -85,62 +88,6 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.T
         )]
 
 
-async def improve_prompt_locally(user_prompt: str, context: str = "") -> str:
-    """Improve prompt using local sampling and rule-based enhancement."""
-    # Read improvement guidelines
-    improvement_instructions = await read_improvement_prompt()
-    
-    # Analyze the prompt for common issues
-    improvements = []
-    
-    # Check for vagueness
-    if len(user_prompt.split()) < 5:
-        improvements.append("Make the request more specific and detailed")
-    
-    # Check for missing context
-    if not context and not any(word in user_prompt.lower() for word in ['python', 'javascript', 'web', 'app', 'code']):
-        improvements.append("Consider adding context about the technology or domain")
-    
-    # Check for unclear objectives
-    if not any(word in user_prompt.lower() for word in ['create', 'build', 'write', 'generate', 'help', 'explain', 'show']):
-        improvements.append("Specify what action you want performed")
-    
-    # Generate improved version based on patterns
-    improved = enhance_prompt_structure(user_prompt, context, improvements)
-    
-    return improved
-
-
-def enhance_prompt_structure(prompt: str, context: str, improvements: list) -> str:
-    """Enhance prompt structure using sampling patterns."""
-    
-    # Start with original prompt
-    enhanced = prompt.strip()
-    
-    # Add role definition if beneficial
-    if any(word in prompt.lower() for word in ['code', 'program', 'develop']):
-        enhanced = f"Act as an expert software developer. {enhanced}"
-    elif any(word in prompt.lower() for word in ['write', 'document', 'explain']):
-        enhanced = f"Act as a technical writer. {enhanced}"
-    
-    # Add specificity
-    if len(enhanced.split()) < 10:
-        enhanced += ". Please provide detailed steps and examples."
-    
-    # Add context if provided
-    if context:
-        enhanced += f"\n\nContext: {context}"
-    
-    # Add format requirements for code requests
-    if any(word in enhanced.lower() for word in ['code', 'function', 'script']):
-        enhanced += "\n\nPlease include:\n- Clear comments explaining the code\n- Error handling where appropriate\n- Example usage"
-    
-    # Add constraints for better results
-    enhanced += "\n\nEnsure the response is practical and actionable."
-    
-    return enhanced
-
-
 async def main():
     """Run the MCP server."""
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
@@ -152,4 +99,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
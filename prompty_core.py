@@ -0,0 +1,209 @@
+import functools
+import re
+from dataclasses import dataclass
+
+
+# Keyword categories recognised by enhance_prompt_structure, one bit each.
+ROLE_CODE = 1
+ROLE_WRITER = 2
+ROLE_UX = 4
+ROLE_DATA = 8
+FMT_CODE = 16
+FMT_EXPLAIN = 32
+# "program" asks for the code block in FULL_PROFILE only, so it has its own bit
+FMT_PROGRAM = 64
+
+FORMAT_FLAGS = FMT_CODE | FMT_PROGRAM | FMT_EXPLAIN
+
+# Keyword words per category, matched against whole words. Each keyword is
+# listed with its common inflections ("coding", "scripts", "explained"); a
+# keyword buried inside another word ("build", "decode") does not count.
+_CODE_WORDS = frozenset({"code", "codes", "coded", "coder", "coders", "coding"})
+_PROGRAM_WORDS = frozenset({"program", "programs", "programmed", "programmer", "programmers", "programming"})
+_EXPLAIN_WORDS = frozenset({"explain", "explains", "explained", "explaining"})
+
+ROLE_CODE_KEYWORDS = _CODE_WORDS | _PROGRAM_WORDS | frozenset({
+    "develop", "develops", "developed", "developer", "developers", "developing", "development",
+})
+ROLE_WRITER_KEYWORDS = _EXPLAIN_WORDS | frozenset({
+    "write", "writes", "writer", "writers", "writing", "written",
+    "document", "documents", "documented", "documenting", "documentation",
+})
+ROLE_UX_KEYWORDS = frozenset({"design", "designs", "designed", "designer", "designers", "designing", "ui", "ux"})
+ROLE_DATA_KEYWORDS = frozenset({
+    "data", "dataset", "datasets", "database", "databases", "analysis", "analyses", "statistics",
+})
+FMT_CODE_KEYWORDS = _CODE_WORDS | frozenset({
+    "function", "functions", "script", "scripts", "scripted", "scripting",
+})
+FMT_PROGRAM_KEYWORDS = _PROGRAM_WORDS
+FMT_EXPLAIN_KEYWORDS = _EXPLAIN_WORDS | frozenset({
+    "describe", "describes", "described", "describing", "what is", "how does",
+})
+
+_CATEGORY_KEYWORDS = (
+    (ROLE_CODE, ROLE_CODE_KEYWORDS),
+    (ROLE_WRITER, ROLE_WRITER_KEYWORDS),
+    (ROLE_UX, ROLE_UX_KEYWORDS),
+    (ROLE_DATA, ROLE_DATA_KEYWORDS),
+    (FMT_CODE, FMT_CODE_KEYWORDS),
+    (FMT_PROGRAM, FMT_PROGRAM_KEYWORDS),
+    (FMT_EXPLAIN, FMT_EXPLAIN_KEYWORDS),
+)
+
+# Each keyword mapped to every category it belongs to. The bits are
+# distinct, so summing them is the same as OR-ing them.
+_KEYWORD_FLAGS = {
+    word: sum(flag for flag, words in _CATEGORY_KEYWORDS if word in words)
+    for word in frozenset().union(*(words for _, words in _CATEGORY_KEYWORDS))
+}
+
+# Longest first, so a word is never cut short by one of its own prefixes
+_KEYWORD_ALTERNATION = "|".join(map(re.escape, sorted(_KEYWORD_FLAGS, key=len, reverse=True)))
+_KEYWORD_INITIALS = "".join(sorted({word[0] for word in _KEYWORD_FLAGS}))
+
+# One alternation of all keywords, so a prompt is classified in a single scan.
+# The initial-letter lookahead rejects most word starts before any
+# alternative is tried; long prompts spend most of the scan on such words.
+# Matching ignores case, so prompts never need a lowercased copy.
+_KEYWORD_RE = re.compile(
+    r"\b(?=[" + _KEYWORD_INITIALS + r"])(?:" + _KEYWORD_ALTERNATION + r")\b", re.IGNORECASE
+)
+
+
+def classify_keywords(text: str) -> int:
+    """Return the bitmask of keyword categories whose words appear in text."""
+    flags = 0
+    # Deduplicate in C first: the Python loop then runs once per distinct
+    # spelling, however long the text and however often keywords repeat.
+    # Unicode case folding can match spellings that do not lowercase back
+    # to a keyword (such as the long s in "ſcript"); those count for nothing
+    for word in set(_KEYWORD_RE.findall(text)):
+        flags |= _KEYWORD_FLAGS.get(word.lower(), 0)
+    return flags
+
+
+@dataclass(frozen=True, eq=False)
+class PromptProfile:
+    """Wording one server uses when enhancing prompts."""
+    # (flag, prefix) pairs in priority order; the first flag present sets the role
+    roles: tuple[tuple[int, str], ...]
+    # Appended to the opening paragraph when it is shorter than ten words
+    specificity: str
+    # (flags, block) pairs; a block is added when any of its flags is present
+    formats: tuple[tuple[int, str], ...]
+    closing: str
+
+
+# Wording of main.py and server.py
+BASIC_PROFILE = PromptProfile(
+    roles=(
+        (ROLE_CODE, "Act as an expert software developer."),
+        (ROLE_WRITER, "Act as a technical writer."),
+    ),
+    specificity=". Please provide detailed steps and examples.",
+    formats=(
+        (FMT_CODE, "Please include:\n- Clear comments explaining the code\n- Error handling where appropriate\n- Example usage"),
+    ),
+    closing="Ensure the response is practical and actionable."
+)
+
+# Wording of auto_improve_main.py
+FULL_PROFILE = PromptProfile(
+    roles=(
+        (ROLE_CODE, "Act as an expert software developer."),
+        (ROLE_WRITER, "Act as a technical writer."),
+        (ROLE_UX, "Act as a UX/UI designer."),
+        (ROLE_DATA, "Act as a data analyst."),
+    ),
+    specificity=". Please provide detailed steps, examples, and explanations.",
+    formats=(
+        (FMT_CODE | FMT_PROGRAM, "Please include:\n- Clear comments explaining the code\n- Error handling where appropriate\n- Example usage\n- Brief explanation of the approach"),
+        (FMT_EXPLAIN, "Please structure your response with:\n- Clear introduction\n- Step-by-step explanation\n- Practical examples\n- Summary of key points"),
+    ),
+    closing="Ensure the response is practical, actionable, and easy to understand."
+)
+
+
+# Prompts longer than this may already be structured enough to pass through as is
+STRUCTURED_PROMPT_MIN_CHARS = 1200
+
+
+def improve_prompt_locally(user_prompt: str, context: str = "", profile: PromptProfile = FULL_PROFILE) -> str:
+    """Improve prompt using local sampling and rule-based enhancement."""
+    # Long prompts that already define a role or carry code blocks gain
+    # nothing from the boilerplate below, so hand them back untouched
+    if not context and len(user_prompt) > STRUCTURED_PROMPT_MIN_CHARS and (
+        "Act as" in user_prompt[:64] or "```" in user_prompt
+    ):
+        return user_prompt
+    
+    # Generate improved version based on patterns
+    return _enhance_cached(user_prompt, context, profile)
+
+
+def enhance_prompt_structure(prompt: str, context: str, profile: PromptProfile = FULL_PROFILE) -> str:
+    """Enhance prompt structure using sampling patterns."""
+    
+    # Classify the original prompt once; the role prefix and the specificity
+    # suffix added during assembly contain no keywords, so nothing needs rescanning
+    flags = classify_keywords(prompt)
+    
+    # Context keywords count towards the format requirements, not the role
+    if context:
+        flags |= classify_keywords(context) & FORMAT_FLAGS
+    
+    # The format checks used to scan the text assembled so far, so a format
+    # block's own wording counts towards the blocks after it (the code block
+    # mentions "explaining", which also asks for the explanation block)
+    for flag, block in profile.formats:
+        if flags & flag:
+            flags |= _block_flags(block)
+    
+    return _assemble_prompt(prompt, context, flags, profile)
+
+
+@functools.cache
+def _block_flags(block: str) -> int:
+    """Return the format bits of one of the profiles' fixed format blocks."""
+    return classify_keywords(block) & FORMAT_FLAGS
+
+
+def _assemble_prompt(prompt: str, context: str, flags: int, profile: PromptProfile) -> str:
+    """Build the enhanced prompt from its classified keyword flags."""
+    
+    # Start with original prompt
+    enhanced = prompt.strip()
+    
+    # Add role definition if beneficial
+    for flag, prefix in profile.roles:
+        if flags & flag:
+            enhanced = f"{prefix} {enhanced}"
+            break
+    
+    # Add specificity for short prompts
+    if len(enhanced.split()) < 10:
+        enhanced += profile.specificity
+    
+    # Collect the remaining paragraphs and join them once at the end
+    sections = [enhanced]
+    
+    # Add context if provided
+    if context:
+        sections.append(f"Context: {context}")
+    
+    # Add format requirements for the kinds of request detected
+    for flag, block in profile.formats:
+        if flags & flag:
+            sections.append(block)
+    
+    # Add constraints for better results
+    sections.append(profile.closing)
+    
+    return "\n\n".join(sections)
+
+
+@functools.lru_cache(maxsize=1024)
+def _enhance_cached(prompt: str, context: str, profile: PromptProfile) -> str:
+    """Memoized enhance_prompt_structure; the result depends only on its arguments."""
+    return enhance_prompt_structure(prompt, context, profile)
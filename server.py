@@ -1,120 +1,188 @@
 import asyncio
-import re
+import json
+import os
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from typing import Any
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import validation_error_definition, validation_error_response_definition
+import msgspec
 import uvicorn
 
+from prompty_core import BASIC_PROFILE, improve_prompt_locally
+
 
 app = FastAPI(title="Prompt Improvement Server", description="MCP server for improving user prompts")
 
 
-class PromptRequest(BaseModel):
+class PromptRequest(msgspec.Struct):
     user_prompt: str
     context: str = ""
 
 
-class PromptResponse(BaseModel):
+class PromptResponse(msgspec.Struct):
     improved_prompt: str
 
 
-async def read_improvement_prompt() -> str:
-    """Read the improvement prompt from the dedicated file."""
-    prompt_file = Path(__file__).parent / "improvement_prompt.md"
-    if prompt_file.exists():
-        return prompt_file.read_text(encoding="utf-8")
-    return "Improve the following prompt to be clearer and more effective:"
+# FastAPI cannot derive OpenAPI schemas from msgspec structs, so the
+# request and response bodies are documented from msgspec's own schemas
+(_REQUEST_SCHEMA, _RESPONSE_SCHEMA), _SCHEMAS = msgspec.json.schema_components(
+    [PromptRequest, PromptResponse], ref_template="#/components/schemas/{name}"
+)
+
+_fastapi_openapi = app.openapi
+
+
+def _openapi() -> dict[str, Any]:
+    """FastAPI's OpenAPI schema plus the components /improve-prompt refers to."""
+    schema = _fastapi_openapi()
+    schema.setdefault("components", {}).setdefault("schemas", {}).update(
+        _SCHEMAS,
+        ValidationError=validation_error_definition,
+        HTTPValidationError=validation_error_response_definition
+    )
+    return schema
+
 
+app.openapi = _openapi
 
-@app.post("/improve-prompt", response_model=PromptResponse)
-async def improve_prompt(request: PromptRequest):
+_OBJECT_ERROR = "Input should be a valid dictionary or object to extract fields from"
+
+
+def _error(error_type: str, loc: tuple, msg: str, value: Any) -> dict[str, Any]:
+    """Return one error in the shape of FastAPI's validation errors."""
+    return {"type": error_type, "loc": loc, "msg": msg, "input": value}
+
+
+def _request_error(body: bytes, is_json: bool) -> Exception:
+    """Return the error FastAPI's own body validation raises for a rejected body.
+    
+    Only called once msgspec has rejected the body, so valid requests never
+    pay for the second parse.
+    """
+    if not body:
+        return RequestValidationError([_error("missing", ("body",), "Field required", None)])
+    if not is_json:
+        text = body.decode(errors="replace")
+        return RequestValidationError([_error("model_attributes_type", ("body",), _OBJECT_ERROR, text)], body=body)
+    
+    try:
+        value = json.loads(body)
+    except json.JSONDecodeError as e:
+        error = _error("json_invalid", ("body", e.pos), "JSON decode error", {})
+        error["ctx"] = {"error": e.msg}
+        return RequestValidationError([error], body=e.doc)
+    except ValueError:
+        return HTTPException(status_code=400, detail="There was an error parsing the body")
+    
+    if not isinstance(value, dict):
+        return RequestValidationError([_error("model_attributes_type", ("body",), _OBJECT_ERROR, value)], body=value)
+    
+    # Every field is a string, so a field is either missing or of the wrong type
+    errors = []
+    for field in msgspec.structs.fields(PromptRequest):
+        loc = ("body", field.encode_name)
+        if field.encode_name not in value:
+            if field.required:
+                errors.append(_error("missing", loc, "Field required", value))
+        elif not isinstance(value[field.encode_name], str):
+            errors.append(_error("string_type", loc, "Input should be a valid string", value[field.encode_name]))
+    
+    # Input the stdlib parser accepts but msgspec does not, such as NaN
+    if not errors:
+        errors.append(_error("json_invalid", ("body",), "JSON decode error", {}))
+    return RequestValidationError(errors, body=value)
+
+
+@app.post(
+    "/improve-prompt",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _REQUEST_SCHEMA}}
+        },
+        "responses": {
+            "200": {
+                "description": "Successful Response",
+                "content": {"application/json": {"schema": _RESPONSE_SCHEMA}}
+            },
+            "422": {
+                "description": "Validation Error",
+                "content": {"application/json": {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}}
+            }
+        }
+    }
+)
+async def improve_prompt(http_request: Request):
     """Improve a user's prompt using AI sampling."""
+    body = await http_request.body()
+    
+    # Only JSON bodies are decoded, as with FastAPI's own body parsing
+    media_type = http_request.headers.get("content-type", "").partition(";")[0].strip().lower()
+    is_json = media_type == "application/json" or (
+        media_type.startswith("application/") and media_type.endswith("+json")
+    )
+    
+    # Decode the body straight into the struct in one pass
+    request = None
+    if body and is_json:
+        try:
+            request = msgspec.json.decode(body, type=PromptRequest)
+        except msgspec.DecodeError:
+            pass
+    if request is None:
+        raise _request_error(body, is_json)
+    
     if not request.user_prompt:
         raise HTTPException(status_code=400, detail="No prompt provided to improve")
     
     try:
         # Use local sampling-based improvement
-        improved_prompt = await improve_prompt_locally(request.user_prompt, request.context)
-        return PromptResponse(improved_prompt=improved_prompt)
+        improved_prompt = improve_prompt_locally(request.user_prompt, request.context, BASIC_PROFILE)
+        return Response(
+            msgspec.json.encode(PromptResponse(improved_prompt=improved_prompt)),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error improving prompt: {str(e)}")
 
 
-async def improve_prompt_locally(user_prompt: str, context: str = "") -> str:
-    """Improve prompt using local sampling and rule-based enhancement."""
-    # Read improvement guidelines
-    improvement_instructions = await read_improvement_prompt()
-    
-    # Analyze the prompt for common issues
-    improvements = []
-    
-    # Check for vagueness
-    if len(user_prompt.split()) < 5:
-        improvements.append("Make the request more specific and detailed")
-    
-    # Check for missing context
-    if not context and not any(word in user_prompt.lower() for word in ['python', 'javascript', 'web', 'app', 'code']):
-        improvements.append("Consider adding context about the technology or domain")
-    
-    # Check for unclear objectives
-    if not any(word in user_prompt.lower() for word in ['create', 'build', 'write', 'generate', 'help', 'explain', 'show']):
-        improvements.append("Specify what action you want performed")
-    
-    # Generate improved version based on patterns
-    improved = enhance_prompt_structure(user_prompt, context, improvements)
-    
-    return improved
-
+# The static endpoints never change, so their JSON bodies are encoded once
+_ROOT_BODY = json.dumps({
+    "message": "Prompt Improvement Server",
+    "description": "Send POST requests to /improve-prompt with your prompt to get improvements",
+    "example": {
+        "user_prompt": "Write code",
+        "context": "Python web application"
+    }
+}, separators=(",", ":")).encode()
 
-def enhance_prompt_structure(prompt: str, context: str, improvements: list) -> str:
-    """Enhance prompt structure using sampling patterns."""
-    
-    # Start with original prompt
-    enhanced = prompt.strip()
-    
-    # Add role definition if beneficial
-    if any(word in prompt.lower() for word in ['code', 'program', 'develop']):
-        enhanced = f"Act as an expert software developer. {enhanced}"
-    elif any(word in prompt.lower() for word in ['write', 'document', 'explain']):
-        enhanced = f"Act as a technical writer. {enhanced}"
-    
-    # Add specificity
-    if len(enhanced.split()) < 10:
-        enhanced += ". Please provide detailed steps and examples."
-    
-    # Add context if provided
-    if context:
-        enhanced += f"\n\nContext: {context}"
-    
-    # Add format requirements for code requests
-    if any(word in enhanced.lower() for word in ['code', 'function', 'script']):
-        enhanced += "\n\nPlease include:\n- Clear comments explaining the code\n- Error handling where appropriate\n- Example usage"
-    
-    # Add constraints for better results
-    enhanced += "\n\nEnsure the response is practical and actionable."
-    
-    return enhanced
+_HEALTH_BODY = json.dumps({"status": "healthy"}, separators=(",", ":")).encode()
 
 
 @app.get("/")
 async def root():
     """Root endpoint with basic information."""
-    return {
-        "message": "Prompt Improvement Server",
-        "description": "Send POST requests to /improve-prompt with your prompt to get improvements",
-        "example": {
-            "user_prompt": "Write code",
-            "context": "Python web application"
-        }
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    # Workers need the app as an import string; app_dir makes it resolvable
+    # regardless of the directory the server is started from. The "auto"
+    # loop is uvloop wherever it is installed (it is not on Windows)
+    uvicorn.run(
+        "server:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        workers=os.cpu_count(),
+        app_dir=str(Path(__file__).parent)
+    )
\ No newline at end of file
@@ -0,0 +1,108 @@
+import pytest
+
+from prompty_core import BASIC_PROFILE, FULL_PROFILE, improve_prompt_locally
+
+# Wording of main.py and server.py before the servers shared prompty_core
+BASIC_SPECIFICITY = ". Please provide detailed steps and examples."
+BASIC_CODE = "Please include:\n- Clear comments explaining the code\n- Error handling where appropriate\n- Example usage"
+BASIC_CLOSING = "Ensure the response is practical and actionable."
+
+# Wording of auto_improve_main.py before the servers shared prompty_core
+FULL_SPECIFICITY = ". Please provide detailed steps, examples, and explanations."
+FULL_CODE = BASIC_CODE + "\n- Brief explanation of the approach"
+FULL_EXPLAIN = (
+    "Please structure your response with:\n- Clear introduction\n- Step-by-step explanation\n"
+    "- Practical examples\n- Summary of key points"
+)
+FULL_CLOSING = "Ensure the response is practical, actionable, and easy to understand."
+
+CODER = "Act as an expert software developer. "
+WRITER = "Act as a technical writer. "
+LONG_PROMPT = "Create a Python function that parses ISO dates and returns datetime objects with timezone info"
+
+LONG_STRUCTURED_PROMPT = (
+    "Act as a release manager.\n\n" + "Review the pending changes and list the risks for each one. " * 24
+)
+
+
+@pytest.mark.parametrize("prompt, context, expected", [
+    ("write code", "", f"{CODER}write code{BASIC_SPECIFICITY}\n\n{BASIC_CODE}\n\n{BASIC_CLOSING}"),
+    (LONG_PROMPT, "", f"{LONG_PROMPT}\n\n{BASIC_CODE}\n\n{BASIC_CLOSING}"),
+    ("Explain how a hash map works", "", f"{WRITER}Explain how a hash map works\n\n{BASIC_CLOSING}"),
+    (
+        "What is a closure", "Python code",
+        f"What is a closure{BASIC_SPECIFICITY}\n\nContext: Python code\n\n{BASIC_CODE}\n\n{BASIC_CLOSING}"
+    ),
+    ("Design a signup page", "", f"Design a signup page{BASIC_SPECIFICITY}\n\n{BASIC_CLOSING}"),
+    (
+        "Summarise the sales data by region", "",
+        f"Summarise the sales data by region{BASIC_SPECIFICITY}\n\n{BASIC_CLOSING}"
+    ),
+    (
+        "Fix the login bug", "Python web application",
+        f"Fix the login bug{BASIC_SPECIFICITY}\n\nContext: Python web application\n\n{BASIC_CLOSING}"
+    ),
+    (
+        "Document the REST API", "Explain the authentication flow",
+        f"{WRITER}Document the REST API{BASIC_SPECIFICITY}\n\n"
+        f"Context: Explain the authentication flow\n\n{BASIC_CLOSING}"
+    ),
+    (
+        "Develop a program that sorts files", "",
+        f"{CODER}Develop a program that sorts files\n\n{BASIC_CLOSING}"
+    ),
+])
+def test_basic_profile_keeps_original_wording(prompt, context, expected):
+    assert improve_prompt_locally(prompt, context, BASIC_PROFILE) == expected
+
+
+@pytest.mark.parametrize("prompt, context, expected", [
+    (
+        "write code", "",
+        f"{CODER}write code{FULL_SPECIFICITY}\n\n{FULL_CODE}\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"
+    ),
+    (LONG_PROMPT, "", f"{LONG_PROMPT}\n\n{FULL_CODE}\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"),
+    (
+        "Explain how a hash map works", "",
+        f"{WRITER}Explain how a hash map works\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"
+    ),
+    (
+        "What is a closure", "Python code",
+        f"What is a closure{FULL_SPECIFICITY}\n\nContext: Python code\n\n"
+        f"{FULL_CODE}\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"
+    ),
+    (
+        "Design a signup page", "",
+        f"Act as a UX/UI designer. Design a signup page{FULL_SPECIFICITY}\n\n{FULL_CLOSING}"
+    ),
+    (
+        "Summarise the sales data by region", "",
+        f"Act as a data analyst. Summarise the sales data by region\n\n{FULL_CLOSING}"
+    ),
+    (
+        "Fix the login bug", "Python web application",
+        f"Fix the login bug{FULL_SPECIFICITY}\n\nContext: Python web application\n\n{FULL_CLOSING}"
+    ),
+    (
+        "Document the REST API", "Explain the authentication flow",
+        f"{WRITER}Document the REST API{FULL_SPECIFICITY}\n\n"
+        f"Context: Explain the authentication flow\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"
+    ),
+    (
+        "Develop a program that sorts files", "",
+        f"{CODER}Develop a program that sorts files\n\n{FULL_CODE}\n\n{FULL_EXPLAIN}\n\n{FULL_CLOSING}"
+    ),
+])
+def test_full_profile_keeps_original_wording(prompt, context, expected):
+    assert improve_prompt_locally(prompt, context, FULL_PROFILE) == expected
+
+
+@pytest.mark.parametrize("profile", [BASIC_PROFILE, FULL_PROFILE])
+def test_long_structured_prompt_passes_through(profile):
+    assert improve_prompt_locally(LONG_STRUCTURED_PROMPT, "", profile) == LONG_STRUCTURED_PROMPT
+
+
+@pytest.mark.parametrize("profile, closing", [(BASIC_PROFILE, BASIC_CLOSING), (FULL_PROFILE, FULL_CLOSING)])
+def test_long_structured_prompt_with_context_is_enhanced(profile, closing):
+    expected = f"{LONG_STRUCTURED_PROMPT.strip()}\n\nContext: Quarterly release\n\n{closing}"
+    assert improve_prompt_locally(LONG_STRUCTURED_PROMPT, "Quarterly release", profile) == expected
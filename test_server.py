@@ -0,0 +1,110 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from server import app
+
+client = TestClient(app)
+
+OBJECT_ERROR = "Input should be a valid dictionary or object to extract fields from"
+
+
+def post(body: bytes, content_type: str | None = "application/json"):
+    headers = {"content-type": content_type} if content_type else {}
+    return client.post("/improve-prompt", content=body, headers=headers)
+
+
+@pytest.mark.parametrize("content_type", ["application/json", "application/json; charset=utf-8", "application/vnd.api+json"])
+def test_improve_prompt(content_type):
+    response = post(b'{"user_prompt": "write code", "context": "Python"}', content_type)
+    assert response.status_code == 200
+    assert response.json()["improved_prompt"].startswith("Act as an expert software developer. write code.")
+
+
+def test_empty_prompt_is_rejected():
+    response = post(b'{"user_prompt": ""}')
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No prompt provided to improve"}
+
+
+# The expected details below are what FastAPI returned when it validated the
+# body itself with the PromptRequest pydantic model
+
+
+@pytest.mark.parametrize("content_type", ["application/json", None])
+def test_missing_body(content_type):
+    response = post(b"", content_type)
+    assert response.status_code == 422
+    assert response.json() == {"detail": [{"type": "missing", "loc": ["body"], "msg": "Field required", "input": None}]}
+
+
+@pytest.mark.parametrize("content_type", ["text/plain", None])
+def test_non_json_content_type(content_type):
+    response = post(b'{"user_prompt":"x"}', content_type)
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"type": "model_attributes_type", "loc": ["body"], "msg": OBJECT_ERROR, "input": '{"user_prompt":"x"}'}
+    ]}
+
+
+def test_malformed_json():
+    response = post(b'{"user_prompt":')
+    assert response.status_code == 422
+    assert response.json() == {"detail": [{
+        "type": "json_invalid",
+        "loc": ["body", 15],
+        "msg": "JSON decode error",
+        "input": {},
+        "ctx": {"error": "Expecting value"}
+    }]}
+
+
+def test_undecodable_json():
+    response = post(b"\xff")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "There was an error parsing the body"}
+
+
+@pytest.mark.parametrize("body, value", [(b"[]", []), (b'"hi"', "hi")])
+def test_non_object_json(body, value):
+    response = post(body)
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"type": "model_attributes_type", "loc": ["body"], "msg": OBJECT_ERROR, "input": value}
+    ]}
+
+
+def test_missing_field():
+    response = post(b"{}")
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"type": "missing", "loc": ["body", "user_prompt"], "msg": "Field required", "input": {}}
+    ]}
+
+
+def test_wrong_field_types():
+    response = post(b'{"user_prompt": null, "context": 2}')
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"type": "string_type", "loc": ["body", "user_prompt"], "msg": "Input should be a valid string", "input": None},
+        {"type": "string_type", "loc": ["body", "context"], "msg": "Input should be a valid string", "input": 2}
+    ]}
+
+
+def test_missing_and_wrong_field():
+    response = post(b'{"context": 2}')
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"type": "missing", "loc": ["body", "user_prompt"], "msg": "Field required", "input": {"context": 2}},
+        {"type": "string_type", "loc": ["body", "context"], "msg": "Input should be a valid string", "input": 2}
+    ]}
+
+
+def test_openapi_documents_validation_errors():
+    schema = client.get("/openapi.json").json()
+    responses = schema["paths"]["/improve-prompt"]["post"]["responses"]
+    assert responses["422"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/HTTPValidationError"
+    }
+    assert {"HTTPValidationError", "ValidationError", "PromptRequest", "PromptResponse"} <= set(
+        schema["components"]["schemas"]
+    )